@@ -6,11 +6,21 @@ the same folder as itself. WARNING: This can make very large SQL query files tha
 """
 
 import csv
+import gzip
+import itertools
+from collections import deque
 import tables
 
-def read_and_convert_to_sql(num_of_entries: int = 100) -> None:
+# Delimiters used inside a single csv cell, eg 'windows;mac;linux' for platforms and '20000-50000' for owners
+LIST_DELIMITER = ';'
+RANGE_DELIMITER = '-'
+
+# Keys of the data each game gets from the description, requirements and steamspy tag csvs
+AUX_HEADERS = ['description', 'minimum', 'recommended', 'tags']
+
+def read_and_convert_to_sql(num_of_entries: int = 100, compress: bool = False) -> None:
     """
-    This function is a user friendly shell to call the two other functions that this module relies on.
+    This function is a user friendly shell to call the other functions that this module relies on.
 
     Reads steam game data from csvs titled steam.csv, steam_description_data.csv, and steam_requirements_data.csv
     located in the directory above, then converts the CSV data into SQL insertions and saves it to three files titled steamgames_load_game_data.sql,
@@ -18,25 +28,29 @@ def read_and_convert_to_sql(num_of_entries: int = 100) -> None:
 
     Parameters:
     num_of_entries: int -> Number of rows to read from steam.csv, excluding the headers. -1 implies reading all available data
+    compress: bool -> Write the files gzip compressed with a .gz extension added to their names. Useful for the full dataset, where the plain files get very large
 
     Returns:
     None
     """
-    _convert_data_to_SQL(_get_steam_data(num_of_entries))
+    _convert_data_to_SQL(_iter_steam_data(num_of_entries), compress)
 
-def _get_steam_data(num_of_entries: int) -> dict:
+def _get_steam_data(num_of_entries: int) -> tuple:
     """
     Reads steam game data from csvs titled steam.csv, steam_description_data.csv, and steam_requirements_data.csv
     located in the directory above and saves the data into a dictionary using the steam app_id as keys.
 
+    Each game is kept as a list of its cells rather than a dictionary, a list is a fraction of the size of a dictionary with the same
+    values and there are tens of thousands of games. Use _iter_steam_data to get the games as dictionaries
+
     Parameters:
     num_of_entries: int -> Number of rows to read from steam.csv, excluding the headers. -1 implies reading all available data
 
     Returns:
-    dict -> Dictionary of steam games gathered from the provided csv files, each game itself is a dictonary where each header from the csvs are keys
+    tuple -> (headers, steam_csv_dict) where steam_csv_dict is a dictionary of steam games gathered from the provided csv files, each game itself is a list
+    holding the value of each header at the same position
     """
     steam_csv_dict = {}
-    headers = []
 
     # In some of the spreadsheets, we don't care about all of the data given. Instead of using headers, we'll copy the columns we want directly
     # if the csv's layout changes, update these constants to match
@@ -45,96 +59,144 @@ def _get_steam_data(num_of_entries: int) -> dict:
     MIN_REQ_COL = 4
     REC_REQ_COL = 5
 
+    # passing -1 as the num_of_entries parameter will cause this to read all entries
+    limit = num_of_entries if num_of_entries >= 0 else None
+
     # Create the initial data from steam csv
     with open('../steam.csv', errors='ignore') as c_file:
         reader = csv.reader(c_file, delimiter=',')
-        lines = 0
-        count = num_of_entries
-        for row in reader:
-            # first row of the csv contains the headers
-            if lines == 0:
-                headers = row
-                lines += 1
-            else:
-                app_id = row[APP_ID_COL]
-                steam_csv_dict[app_id] = {}
-                for i in range(len(headers)):
-                    steam_csv_dict[app_id][headers[i]] = row[i]
-                count -= 1
-                
-                # Go until we hit the number of entries wanted, passing -1 as the num_of_entries parameter will cause this to read all entries
-                if  count == 0:
-                    break
+        # first row of the csv contains the headers, the data from the other csvs goes in columns after them
+        headers = next(reader)
+        DESCRIPTION, MINIMUM, RECOMMENDED, TAGS = range(len(headers), len(headers) + len(AUX_HEADERS))
+        headers += AUX_HEADERS
+        # Go until we hit the number of entries wanted
+        for row in itertools.islice(reader, limit):
+            # Games missing from the other csvs keep these defaults
+            row += ('', '', '', {})
+            steam_csv_dict[row[APP_ID_COL]] = row
 
     # Add description data
     with open('../steam_description_data.csv', errors='ignore') as c_file:
         reader = csv.reader(c_file, delimiter=',')
-        lines = 0
-        count = num_of_entries
-        for row in reader:
-            if lines == 0:
-                # dont need the headers
-                lines += 1
-                continue
-            else:
-                # use the Steam APP_ID to link together the spreadsheets
-                if row[APP_ID_COL] in steam_csv_dict:
-                    steam_csv_dict[row[APP_ID_COL]]['description'] = row[SHORT_DESC_COL]
-                    count -= 1
-                    
-            if count == 0:
-                break
+        # dont need the headers
+        next(reader)
+        for game, row in _match_games(reader, steam_csv_dict, APP_ID_COL, limit):
+            game[DESCRIPTION] = row[SHORT_DESC_COL]
 
     # Add requirement data
     with open('../steam_requirements_data.csv', errors='ignore') as c_file:
         reader = csv.reader(c_file, delimiter=',')
-        lines = 0
-        count = num_of_entries
-
-        for row in reader:
-            if lines == 0:
-                lines += 1
-                continue
-            else:
-                if row[APP_ID_COL] in steam_csv_dict:
-                    steam_csv_dict[row[APP_ID_COL]]['minimum'] = row[MIN_REQ_COL]
-                    steam_csv_dict[row[APP_ID_COL]]['recommended'] = row[REC_REQ_COL]
-                    count -= 1
-                    
-            if count == 0:
-                break
+        next(reader)
+        for game, row in _match_games(reader, steam_csv_dict, APP_ID_COL, limit):
+            game[MINIMUM] = row[MIN_REQ_COL]
+            game[RECOMMENDED] = row[REC_REQ_COL]
 
     # Add steamspy tag data
     with open('../steamspy_tag_data.csv', errors='ignore') as c_file:
         reader = csv.reader(c_file, delimiter=',')
-        lines = 0
-        count = num_of_entries
-
-        for row in reader:
-            if lines == 0:
-                lines += 1
-                headers = row
-                continue
-            else:
-                if row[APP_ID_COL] in steam_csv_dict:
-                    steam_csv_dict[row[APP_ID_COL]]["tags"] = {}
-                    for i in range(1, len(headers)):
-                        if int(row[i]) > 0:
-                            steam_csv_dict[row[APP_ID_COL]]['tags'][headers[i]] = row[i]
-                    count -= 1
-                    
-            if count == 0:
-                break
-
-    return steam_csv_dict
-
-def _convert_data_to_SQL(steam_csv_dict: dict) -> None:
+        # the first column is the app_id, every column after it is a tag
+        tag_headers = next(reader)[1:]
+        for game, row in _match_games(reader, steam_csv_dict, APP_ID_COL, limit):
+            # Most of the few hundred tag columns are 0 for any game, comparing the text skips parsing every one of them into an int
+            game[TAGS] = {tag: tag_count for tag, tag_count in zip(tag_headers, row[1:]) if tag_count != '0'}
+
+    return headers, steam_csv_dict
+
+def _match_games(reader, steam_csv_dict: dict, app_id_col: int, limit):
+    """
+    Pairs the rows of a csv with the games they belong to, skipping rows of games that weren't read from steam.csv
+
+    Parameters:
+    reader: iterable -> csv reader positioned after the headers
+    steam_csv_dict: dict -> Dictionary of steam games keyed by app_id, as built by _get_steam_data
+    app_id_col: int -> Column of the csv holding the steam app_id
+    limit: int -> Number of matching rows to stop after, None to read every row
+
+    Returns:
+    iterator -> (game, row) for each row whose app_id is in steam_csv_dict
+    """
+    # use the Steam APP_ID to link together the spreadsheets, getting the game once instead of checking for it and then indexing it
+    matches = ((game, row) for row in reader if (game := steam_csv_dict.get(row[app_id_col])) is not None)
+    # islice stops reading the file once every game has been matched, without counting matches by hand
+    return itertools.islice(matches, limit)
+
+def _iter_steam_data(num_of_entries: int):
+    """
+    Reads steam game data with _get_steam_data and yields the games one at a time in the order they were read. Each game is let go
+    as soon as it's yielded, so the csv data of converted games can be freed while the rest are still being converted instead of all
+    of it staying in memory until the end
+
+    Parameters:
+    num_of_entries: int -> Number of rows to read from steam.csv, excluding the headers. -1 implies reading all available data
+
+    Yields:
+    tuple -> (app_id, game) where game is a dictonary where each header from the csvs are keys
+    """
+    headers, steam_csv_dict = _get_steam_data(num_of_entries)
+    # Move the games into a deque so they can be taken off the front in O(1), popping the first key of a dict gets slower as it empties
+    games = deque(steam_csv_dict.items())
+    steam_csv_dict.clear()
+    while games:
+        app_id, row = games.popleft()
+        # Only the game being converted is held as a dictionary, zip pairs each header with its cell in C
+        yield app_id, dict(zip(headers, row))
+
+def _parse_game_numeric(app_id: str, game: dict) -> tuple:
+    """
+    Converts the numeric fields of a game from the strings read out of the csvs into the values the Game table expects. The string
+    fields (name, release date, description, requirements) are left to the caller so all of the number parsing happens in one pass
+
+    Parameters:
+    app_id: str -> Steam app_id of the game as read from the csv
+    game: dict -> A single game from the dictionary returned by _get_steam_data
+
+    Returns:
+    tuple -> (app_id, achievements, english, positive_ratings, negative_ratings, average_playtime, median_playtime, owners lower bound, owners upper bound, price)
+
+    Raises:
+    ValueError if any of the fields aren't valid numbers
     """
-    Converts a dictionary of steamgames into a SQL file with insert statements for the steamgames database as described by steamgames_schema.sql
+    # owners represents the lower and upper bounds of owners of the game, split into the 2 numbers to insert into the database
+    owner_low, owner_high = game['owners'].split(RANGE_DELIMITER)
+    return (
+        int(app_id),
+        int(game['achievements']),
+        # english is '0' or '1', bool() of either non-empty string would always be True
+        game['english'] == '1',
+        int(game['positive_ratings']),
+        int(game['negative_ratings']),
+        int(game['average_playtime']),
+        int(game['median_playtime']),
+        int(owner_low),
+        int(owner_high),
+        float(game['price'])
+    )
+
+def _open_sql_file(filename: str, compress: bool):
+    """
+    Opens a SQL file for writing text, optionally gzip compressed
 
     Parameters:
-    steam_csv_dict: dict -> Dictionary of steam games gathered from the provided csv files, each game itself is a dictonary where each header from the csvs are keys. Each entry
-    of the dictionary must contain the following keys: 'name', 'release_date', 'achievements', 'english', 'positive_ratings', 'negative_ratings', 'average_playtime', 'median_playtime', 'owners', and 'price'
+    filename: str -> Name of the file to write
+    compress: bool -> Write the file gzip compressed, adding .gz to filename
+
+    Returns:
+    file object -> The opened file, to be used as a context manager
+    """
+    if compress:
+        # Low compression levels already shrink the repetitive insert statements a lot while costing little time to write
+        return gzip.open(filename + '.gz', 'wt', compresslevel=3)
+    return open(filename, 'w')
+
+def _convert_data_to_SQL(games, compress: bool = False) -> None:
+    """
+    Converts steamgames into a SQL file with insert statements for the steamgames database as described by steamgames_schema.sql
+
+    Parameters:
+    games: iterable -> (app_id, game) pairs of steam games gathered from the provided csv files, such as from _iter_steam_data. Each game is a dictonary where each header from the csvs are keys
+    and must contain the following keys: 'name', 'release_date', 'achievements', 'english', 'developer', 'publisher', 'platforms', 'required_age', 'categories', 'genres',
+    'positive_ratings', 'negative_ratings', 'average_playtime', 'median_playtime', 'owners', 'price', 'description', 'minimum', 'recommended', and 'tags'
+    compress: bool -> Write the files gzip compressed with a .gz extension added to their names
 
     Returns:
     None
@@ -147,166 +209,84 @@ def _convert_data_to_SQL(steam_csv_dict: dict) -> None:
     gameratings_table = tables.IntersectionTable("Game", "Rating")
     gamecategories_table = tables.IntersectionTable("Game", "Category")
     gamegenres_table = tables.IntersectionTable("Game", "Genre")
-    gametags_table = tables.IntersectionTable("Game", "Genre")
-
-    tables.Game.game_list = {}
-
-    for app_id in steam_csv_dict:
-        game = steam_csv_dict[app_id]
-        # owners represents the lower and upper bounds of owners of the game, split into the 2 numbers to insert into the database
-        owners = game['owners'].split('-')
-        if 'description' not in game:
-            game['description'] = ''
-        if 'minimum' not in game:
-            game['minimum'] = ''
-        if 'recommended' not in game:
-            game['recommended'] = ''
-
+    # SteamSpy tags are stored as genres, steamgames_schema.sql links them to the Genre table through GameTags
+    gametags_table = tables.IntersectionTable("Game", "Genre", "GameTags")
+
+    # Columns that hold a list of names, the method finding or adding a name to its table, and the method adding them to the intersection table linking them to the game
+    list_columns = (
+        ('developer', tables.DeveloperTable.add, gamedevs_table.add_entry),
+        ('publisher', tables.PublisherTable.add, gamepubs_table.add_entry),
+        ('platforms', tables.PlatformTable.add, gameplat_table.add_entry),
+        ('categories', tables.CategoryTable.add, gamecategories_table.add_entry),
+        ('genres', tables.GenreTable.add, gamegenres_table.add_entry)
+    )
+
+    # Look these up once here rather than through the module and class attributes for every game
+    Game = tables.Game
+    add_rating_name = tables.RatingTable.add
+    add_genre_name = tables.GenreTable.add
+    add_rating = gameratings_table.add_entry
+    add_tag = gametags_table.add_entry
+
+    # Start from empty tables in case data was already converted in this session
+    tables.reset_all()
+
+    for app_id, game in games:
         # This has a bug, if any table after game rejects the entry, the entry will remain in prior tables without required relationships such as
         # "a game must have a developer"
         try:
-            # These attribute headers should be set as constants
-            new_game = tables.Game(
-                int(app_id), 
+            steam_app_id, achievements, in_english, positives, negatives, ave_play_time, med_play_time, owner_low, owner_high, price = _parse_game_numeric(app_id, game)
+            new_game = Game(
+                steam_app_id, 
                 game['name'], 
                 game['release_date'], 
-                game['achievements'],
-                bool(game['english']),
-                int(game['positive_ratings']),
-                int(game['negative_ratings']),
-                int(game['average_playtime']),
-                int(game['median_playtime']),
-                int(owners[0]),
-                int(owners[1]),
-                float(game['price']),
+                achievements,
+                in_english,
+                positives,
+                negatives,
+                ave_play_time,
+                med_play_time,
+                owner_low,
+                owner_high,
+                price,
                 game['description'],
                 game['minimum'],
                 game['recommended']
             )
 
-            # secondary delimiter should be variable
-            # These following loops could be a single function to reduce code duplication
-            developers = game['developer'].split(';')
-            for dev in developers:
-                if tables.DeveloperTable.__contains__(dev):
-                    dev_id = tables.DeveloperTable.index(dev) + 1
-                else:
-                    new_dev = tables.DeveloperTable(dev)
-                    dev_id = new_dev.id
-                
-                gamedevs_table.add_entry(new_game.id, dev_id)
-            
-            publishers = game['publisher'].split(';')
-            for pub in publishers:
-                if tables.PublisherTable.__contains__(pub):
-                    pub_id = tables.PublisherTable.index(pub) + 1
-                else:
-                    new_pub = tables.PublisherTable(pub)
-                    pub_id = new_pub.id
-                
-                gamepubs_table.add_entry(new_game.id, pub_id)
-            
-            platforms = game['platforms'].split(';')
-            for plat in platforms:
-                if tables.PlatformTable.__contains__(plat):
-                    plat_id = tables.PlatformTable.index(plat) + 1
-                else:
-                    new_plat = tables.PlatformTable(plat)
-                    plat_id = new_plat.id
-
-                gameplat_table.add_entry(new_game.id, plat_id)
-
-            rating = game['required_age']
-            if tables.RatingTable.__contains__(rating):
-                rating_id = tables.RatingTable.index(rating) + 1
-            else:
-                new_rating = tables.RatingTable(rating)
-                rating_id = new_rating.id
-
-            gameratings_table.add_entry(new_game.id, rating_id)
-
-            categories = game['categories'].split(';')
-            for cat in categories:
-                if tables.CategoryTable.__contains__(cat):
-                    cat_id = tables.CategoryTable.index(cat) + 1
-                else:
-                    new_cat = tables.CategoryTable(cat)
-                    cat_id = new_cat.id
-
-                gamecategories_table.add_entry(new_game.id, cat_id)
-
-            genres = game['genres'].split(';')
-            for genre in genres:
-                if tables.GenreTable.__contains__(genre):
-                    genre_id = tables.GenreTable.index(genre) + 1
-                else:
-                    new_genre = tables.GenreTable(genre)
-                    genre_id = new_genre.id
-
-                gamegenres_table.add_entry(new_game.id, genre_id)
+            # A game only has one rating so it isn't split like the list columns
+            game_id = new_game.id
+            add_rating(game_id, add_rating_name(game['required_age']))
+
+            for column, add_name, add_entry in list_columns:
+                for name in game[column].split(LIST_DELIMITER):
+                    add_entry(game_id, add_name(name))
             
-            steamspy_tags = game['tags']
-            for tag in steamspy_tags:
-                if tables.GenreTable.__contains__(tag):
-                    genre_id = tables.GenreTable.index(tag) + 1
-                else:
-                    new_genre = tables.GenreTable(tag)
-                    genre_id = new_genre.id
-                
-                gametags_table.add_entry(new_game.id, genre_id, steamspy_tags[tag])
-        except ValueError:
+            # Tag counts are still the strings read from the csv, the GameTags table stores them as ints
+            for tag, tag_count in game['tags'].items():
+                add_tag(game_id, add_genre_name(tag), int(tag_count))
+        except ValueError as e:
             # If theres any error with the data that causes it to not be able to be in the database, skip the entry
+            print(f"appid:{app_id} {e}")
             continue
     
     # Create three different files to reduce amount that MySQL workbench lags when opening them up. These files can get large
-    with open("steamgames_load_game_data.sql", "w") as f:
+    # Each table is written as multi-row inserts, MySQL loads these much faster than one insert per row
+    with _open_sql_file("steamgames_load_game_data.sql", compress) as f:
         f.write('USE steamgames;\n\n')
-        for id in tables.Game.game_list:
-            f.write(tables.Game.game_list[id].to_sql_insert() + '\n')
+        tables.Game.write_sql(f, tables.Game.game_list.values())
 
-    with open("steamgames_load_aux_data.sql", "w") as f:
+    with _open_sql_file("steamgames_load_aux_data.sql", compress) as f:
         f.write('USE steamgames;\n\n')
-        for e in tables.DeveloperTable.table:
-            f.write(e.to_sql_insert() + '\n')
-
-        f.write('\n')
-
-        for e in tables.PublisherTable.table:
-            f.write(e.to_sql_insert() + '\n')
-
-        f.write('\n')
-
-        for e in tables.RatingTable.table:
-            f.write(e.to_sql_insert() + '\n')
-        
-        f.write('\n')
-
-        for e in tables.PlatformTable.table:
-            f.write(e.to_sql_insert() + '\n')
-        
-        f.write('\n')
-
-        for e in tables.CategoryTable.table:
-            f.write(e.to_sql_insert() + '\n')
-        
-        f.write('\n')
-
-        for e in tables.GenreTable.table:
-            f.write(e.to_sql_insert() + '\n')
+        aux_tables = (tables.DeveloperTable, tables.PublisherTable, tables.RatingTable, tables.PlatformTable, tables.CategoryTable, tables.GenreTable)
+        for i, table in enumerate(aux_tables):
+            # Separate each table's inserts with a blank line
+            if i:
+                f.write('\n')
+            table.write_sql(f, table.table)
         
-    with open("steamgames_load_intersection_data.sql", "w") as f:
+    with _open_sql_file("steamgames_load_intersection_data.sql", compress) as f:
         f.write('USE steamgames;\n\n')
-        f.write(gamedevs_table.to_sql_insert())
-        f.write(gamepubs_table.to_sql_insert())
-        f.write(gameplat_table.to_sql_insert())
-        f.write(gameratings_table.to_sql_insert())
-        f.write(gamecategories_table.to_sql_insert())
-        f.write(gamegenres_table.to_sql_insert())
-        f.write(gametags_table.to_sql_insert(include_val=True))
-            
-
-
-            
-
-
-        
\ No newline at end of file
+        for table in (gamedevs_table, gamepubs_table, gameplat_table, gameratings_table, gamecategories_table, gamegenres_table):
+            table.write_sql(f)
+        gametags_table.write_sql(f, include_val=True)
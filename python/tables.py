@@ -3,22 +3,115 @@
 
 This module contains classes to represent final tables of the steamgames database. In practice it acts similarly to an ORM such as SQLAlchemy, where each table is a class that keeps track of its members and each element of a table is an object of the
 same class. The exception to this are intersection tables, where each member of the class is itself a table. If any entry has unsupported values (such as too long names), then the entry should be rejected with a ValueError
+describing why, it's up to the caller to report it
 """
-from abc import ABC, abstractmethod
+from abc import ABC, ABCMeta, abstractmethod
+from array import array
+from itertools import islice
 
 LONG_STRING_LIMIT = 2048 # Same as the limitations in the MySQL Database
+SHORT_STRING_LIMIT = 1024
+# Longest allowed description, minimum requirements and recommended requirements of a game, in that order, matching the Game table
+_GAME_TEXT_LIMITS = (('Description', SHORT_STRING_LIMIT), ('Minimum Requirements', LONG_STRING_LIMIT), ('Recommended Requirements', SHORT_STRING_LIMIT))
+BULK_INSERT_CHUNK = 1000 # Rows per multi-row insert statement, keeps each statement well under MySQL's default max_allowed_packet
+
+# Strings in the SQL inserts are quoted with either double or single quotes, so both quotes and the backslash used to escape them need escaping.
+# Line breaks are escaped as well so every row of a multi-row insert stays on its own line, MySQL reads \n and \r back as the same characters
+_SQL_ESCAPE = str.maketrans({'\\': '\\\\', '"': '\\"', "'": "\\'", '\n': '\\n', '\r': '\\r'})
+
+def _escape_sql(s: str) -> str:
+    """
+    Escapes a string to be placed inside a quoted string of an SQL insert statement
+
+    Parameters:
+        s: str -> String to escape
+
+    Returns:
+        str -> s with backslashes, double quotes, single quotes and line breaks escaped by a backslash
+    """
+    # Most strings have nothing to escape, checking with in is far cheaper than translate which always builds a new string
+    if '"' not in s and "'" not in s and '\\' not in s and '\n' not in s and '\r' not in s:
+        return s
+    return s.translate(_SQL_ESCAPE)
+
+def _iter_bulk_sql_insert(header: str, values, chunk: int):
+    """
+    Combines the values of many rows into multi-row SQL insert statements of up to chunk rows each, one statement at a time
+
+    Parameters:
+        header: str -> Start of the insert statement up to and including VALUES, eg 'INSERT INTO Developer(ID, Name) VALUES'
+        values: iterable -> Parenthesized values of each row, eg '(1,"Valve")'
+        chunk: int -> Maximum number of rows in a single insert statement
+
+    Returns:
+        iterator -> SQL insert statements, each followed by a newline. Empty if there are no values
+    """
+    values = iter(values)
+    while True:
+        rows = list(islice(values, chunk))
+        if not rows:
+            return
+        yield header + '\n' + ',\n'.join(rows) + ';\n'
+
+def _bulk_sql_insert(header: str, values, chunk: int) -> str:
+    """
+    Combines the values of many rows into multi-row SQL insert statements of up to chunk rows each
+
+    Parameters:
+        header: str -> Start of the insert statement up to and including VALUES, eg 'INSERT INTO Developer(ID, Name) VALUES'
+        values: iterable -> Parenthesized values of each row, eg '(1,"Valve")'
+        chunk: int -> Maximum number of rows in a single insert statement
+
+    Returns:
+        str -> SQL insert statements, each followed by a newline. Empty if there are no values
+    """
+    return ''.join(_iter_bulk_sql_insert(header, values, chunk))
+
+class _TableMeta(ABCMeta):
+    """
+    Metaclass of the lookup tables. Python looks up the magic method for `in` on the type of the object, so it has to be defined
+    here for `name in DeveloperTable` to work on the class itself
+
+    Methods:
+        __contains__(cls, str): bool -> Returns whether str is the name of an element in the table
+    """
+    def __contains__(cls, str):
+        """
+        Returns whether the given string a name of an element in the table
+        
+        Parameters:
+            str: str -> Name to find existence of
+        
+        Returns:
+            bool -> Returns True if str is the name of an element in the table, False otherwise
+        """
+        # Compare casefolded values to be case-insensitive
+        return str.casefold() in cls._index
+
 
 class SimpleTable(ABC):
     """
     Base abstract class for all tables except for intersection tables. Each class that inherits SimpleTable represents a table and each member of that class is a row in the table.
 
+    Class Variables:
+        _sql_header: str -> Start of the SQL insert statement for the table, up to and including VALUES. Set by each subclass
+
     Attributes:
         id:int -> MySQL primary index, 1 indexed
         name:str -> Name of the table element, eg Title of a game or Name of a Developer
 
     Methods:
         to_sql_insert(self): str -> Converts a member of a class that inherits SimpleTable into a SQL insert statement
+        _sql_values(self): str -> Converts a member of a class that inherits SimpleTable into the values of a SQL insert statement
+
+    Class Methods:
+        to_bulk_sql_insert(cls, rows, chunk): str -> Converts many members of the class into multi-row SQL insert statements
+        write_sql(cls, fp, rows, chunk): None -> Writes many members of the class to a file as multi-row SQL insert statements
     """
+    # A row is created for every game and every name in the data, slots keep each one from carrying its own __dict__
+    __slots__ = ('id', 'name')
+    _sql_header = ""
+
     def __init__(self, name, id, name_char_limit = 32):
         """
         Inititalizes a member of a SimpleTable. Raises ValueError if length of name is greater than name_char_limit.
@@ -32,19 +125,58 @@ class SimpleTable(ABC):
             None
         """
         if (len(name) > name_char_limit):
-            print(f"{name} not added to table, title is greater than {name_char_limit} characters long")
-            raise ValueError
+            raise ValueError(f"{name} not added to table, title is greater than {name_char_limit} characters long")
 
         self.id = id
-        self.name = name.replace('"', '\\"') # Strings in the SQL inserts with use double quotes, so we want to escape any double quotes that are in the data
+        self.name = _escape_sql(name)
 
     # All tables should have a way to convert their entries to SQL
     @abstractmethod
+    def _sql_values(self) -> str:
+        """
+        Converts self into the parenthesized values of an SQL insert statement
+        """
+        pass
+
     def to_sql_insert(self) -> str:
         """
         Converts self into an SQL insert statement
+
+        Returns:
+            str -> SQL insert statement
         """
-        pass
+        return self._sql_header + self._sql_values() + ';'
+
+    @classmethod
+    def to_bulk_sql_insert(cls, rows, chunk = BULK_INSERT_CHUNK) -> str:
+        """
+        Converts members of the class into multi-row SQL insert statements. MySQL runs one statement with many rows much faster than
+        one statement per row
+
+        Parameters:
+            rows: iterable -> Members of the class to convert, eg DeveloperTable.table
+            chunk: int -> Maximum number of rows in a single insert statement
+
+        Returns:
+            str -> SQL insert statements, each followed by a newline
+        """
+        return _bulk_sql_insert(cls._sql_header, (row._sql_values() for row in rows), chunk)
+
+    @classmethod
+    def write_sql(cls, fp, rows, chunk = BULK_INSERT_CHUNK) -> None:
+        """
+        Writes members of the class to fp as multi-row SQL insert statements. Unlike to_bulk_sql_insert only one statement
+        is held in memory at a time instead of the whole table
+
+        Parameters:
+            fp: file -> Text file to write the statements to
+            rows: iterable -> Members of the class to convert, eg DeveloperTable.table
+            chunk: int -> Maximum number of rows in a single insert statement
+
+        Returns:
+            None
+        """
+        fp.writelines(_iter_bulk_sql_insert(cls._sql_header, (row._sql_values() for row in rows), chunk))
 
 
 class Game(SimpleTable):
@@ -54,6 +186,7 @@ class Game(SimpleTable):
 
     Class Variables:
         game_list: dict -> Class wide dictionary to store each member of the class keyed by app_id
+        _sql_header: str -> Start of the SQL insert statement for the table, up to and including VALUES
 
     Attributes:
         id: int -> MySQL primary index
@@ -74,9 +207,12 @@ class Game(SimpleTable):
         rec_reqs: str -> The game's recommended system requirements
 
     Methods:
-        to_sql_insert(self): str ->  Converts a member of a class into a SQL insert statement
+        _sql_values(self): str -> Converts a member of a class into the values of a SQL insert statement
     """
+    __slots__ = ('app_id', 'release_date', 'achieve_count', 'in_eng', 'positives', 'negatives', 'ave_play_time', 'med_play_time',
+                 'owner_low', 'owner_high', 'price', 'desc', 'min_reqs', 'rec_reqs')
     game_list = {}
+    _sql_header = "INSERT INTO Game(ID,SteamAppID,Title,ReleaseDate,AchievementCount,InEnglish,PositiveRatingCount,NegativeRatingCount,AvePlayTime,MedPlayTime,OwnerCountLowerBound,OwnerCountUpperBound,Price,Description,MinimumRequirements,RecommendedRequirements) VALUES"
 
     def __init__(self, app_id, title, release_date = None, achieve_count = 0, 
                  in_eng = False, positives = 0, negatives = 0, ave_play_time = None, 
@@ -111,20 +247,13 @@ class Game(SimpleTable):
 
         # Check for valid data, return the errors
         if (app_id in Game.game_list):
-            print(f"{title} already exists in game list, game with appid:{app_id} not added")
-            raise ValueError
+            raise ValueError(f"{title} already exists in game list, game with appid:{app_id} not added")
         
-        if (len(desc) > 1024):
-            print(f"{title} not added, description is greater than 1024 characters long")
-            raise ValueError
-        
-        if (len(min_reqs) > LONG_STRING_LIMIT):
-            print(f"{title} not added, Minimum Requirements is greater than {LONG_STRING_LIMIT} characters long")
-            raise ValueError
-        
-        if (len(rec_reqs) > 1024):
-            print(f"{title} not added, Recommended Requirements is greater than 1024 characters long")
-            raise ValueError
+        # Almost every game fits, so check all three at once and only walk the limits to find which field is too long when one is
+        if (len(desc) > SHORT_STRING_LIMIT or len(min_reqs) > LONG_STRING_LIMIT or len(rec_reqs) > SHORT_STRING_LIMIT):
+            for (field, limit), value in zip(_GAME_TEXT_LIMITS, (desc, min_reqs, rec_reqs)):
+                if (len(value) > limit):
+                    raise ValueError(f"{title} not added, {field} is greater than {limit} characters long")
         
         # MySQL IDs are 1 indexed
         super().__init__(title, len(Game.game_list)+1, 64)
@@ -139,49 +268,55 @@ class Game(SimpleTable):
         self.owner_low = owner_low
         self.owner_high = owner_high
         self.price = price
-        # Strings in the SQL inserts with use double quotes, so we want to escape any double quotes that are in the data
-        self.desc = desc.replace('"', '\\"')
-        self.min_reqs = min_reqs.replace('"', '\\"')
-        self.rec_reqs = rec_reqs.replace('"', '\\"')
+        self.desc = _escape_sql(desc)
+        self.min_reqs = _escape_sql(min_reqs)
+        self.rec_reqs = _escape_sql(rec_reqs)
 
         Game.game_list[app_id] = self
 
-    def to_sql_insert(self) -> str:
+    def _sql_values(self) -> str:
         """
-        Converts self into an SQL insert statement
+        Converts self into the parenthesized values of an SQL insert statement
 
         Returns:
-            str -> SQL insert statement
+            str -> Values of self formatted for an SQL insert statement
         """
-        return f"INSERT INTO Game(ID,SteamAppID,Title,ReleaseDate,AchievementCount,InEnglish,PositiveRatingCount,NegativeRatingCount,AvePlayTime,MedPlayTime,OwnerCountLowerBound,OwnerCountUpperBound,Price,Description,MinimumRequirements,RecommendedRequirements) VALUES({self.id},{self.app_id},\"{self.name}\",\"{self.release_date}\",{self.achieve_count},{self.in_eng},{self.positives},{self.negatives},{self.ave_play_time},{self.med_play_time},{self.owner_low},{self.owner_high},{self.price},\"{self.desc}\",\"{self.min_reqs}\",\"{self.rec_reqs}\");"
+        return f"({self.id},{self.app_id},\"{self.name}\",\"{self.release_date}\",{self.achieve_count},{self.in_eng},{self.positives},{self.negatives},{self.ave_play_time},{self.med_play_time},{self.owner_low},{self.owner_high},{self.price},\"{self.desc}\",\"{self.min_reqs}\",\"{self.rec_reqs}\")"
     
 
-class DeveloperTable(SimpleTable):
+class LookupTable(SimpleTable, metaclass=_TableMeta):
     """
-    Class that represents the Developer table of the steamgames db, each member of the class represents a row
-    of the table
+    Base class for the tables that only store a unique name per row, such as developers or genres. Names are compared casefolded,
+    so each one is stored once no matter how it is capitalised. Each subclass keeps its own table and _index
 
     Class Variables:
-        table: array -> Class wide array to store each member of the class
+        table: array -> Class wide array to store each member of the class. Set by each subclass
+        _index: dict -> Class wide dictionary mapping the casefolded name of each member of the class to its id. Set by each subclass
+        _name_char_limit: int -> Maximum allowable length of a name in the table
 
     Attributes:
         id: int -> MySQL primary index
-        name: str -> Name of the Developer
+        name: str -> Name of the row
 
     Methods:
-        to_sql_insert(self): str ->  Converts a member of a class into a SQL insert statement
+        _sql_values(self): str -> Converts a member of a class into the values of a SQL insert statement
 
     Class Methods:
-        __contains__(cls, str): bool -> Returns whether str is in the table
+        add(cls, str): int -> Returns the id of str in the table, adding it first if it isn't in the table yet
         def index(cls, str): int -> Returns the index of str in the table if it exists, raises value error otherwise
+        get_id(cls, str): int -> Returns the id of str in the table if it exists, raises value error otherwise
     """
+    __slots__ = ()
     table = []
+    _index = {}
+    _name_char_limit = 32
+
     def __init__(self, name):
         """
-        Initializes an instance of the developer class and appends it to the table class variable
+        Initializes a row of the table and appends it to the table class variable
 
         Parameters:
-            name: str -> Name of the developer
+            name: str -> Name of the row
 
         Returns:
             None
@@ -189,44 +324,48 @@ class DeveloperTable(SimpleTable):
         Raises:
             ValueError on invalid data
         """
-        id = len(DeveloperTable.table) + 1
-        super().__init__(name, id)
-        DeveloperTable.table.append(self)
-    
-    def to_sql_insert(self):
+        cls = type(self)
+        id = len(cls.table) + 1
+        super().__init__(name, id, cls._name_char_limit)
+        cls._index[name.casefold()] = id
+        cls.table.append(self)
+
+    def _sql_values(self) -> str:
         """
-        Converts self into an SQL insert statement
+        Converts self into the parenthesized values of an SQL insert statement
 
         Returns:
-            str -> SQL insert statement
+            str -> Values of self formatted for an SQL insert statement
         """
-        return f"INSERT INTO Developer(ID, Name) VALUES({self.id},\"{self.name}\");"
-    
+        return f"({self.id},\"{self.name}\")"
+
     @classmethod
-    def __contains__(cls, str):
+    def add(cls, str):
         """
-        Returns whether the given string a name of an element in the table
-        
+        Returns the id of the row with the same name as the given string, adding a new row for it first if there isn't one
+
         Parameters:
-            str: str -> Name of rating to find existence of
-        
+            str: str -> Name of the row to find or add
+
         Returns:
-            bool -> Returns True if str is the name of an element in the table, False otherwise
+            int -> id of str in the table
+
+        Raises:
+            ValueError if the row has to be added and the name is rejected
         """
-        # This method doesn't work like a magic method as intended, have to call it directly. Should change to another method name
-        for e in cls.table:
-            # Compare lowercase values to be case-insensitive
-            if e.name.lower() == str.lower():
-                return True
-        return False
-    
+        # a single dictionary lookup instead of checking membership and then searching for the index
+        id = cls._index.get(str.casefold())
+        if id is None:
+            id = cls(str).id
+        return id
+
     @classmethod
     def index(cls, str):
         """
-        Returns the index of the developer with the same name as the given string in the table. Raises a ValueError if str is not a name of an element of the table
+        Returns the index of the row with the same name as the given string in the table. Raises a ValueError if str is not a name of an element of the table
         
         Parameters:
-            str: str -> Name of developer to search for index
+            str: str -> Name of the row to search for index
         
         Returns:
             int -> Index of str in the table
@@ -234,457 +373,181 @@ class DeveloperTable(SimpleTable):
         Raises:
             ValueError if str is not found in the table
         """
-        for i in range(len(cls.table)):
-            if cls.table[i].name.lower() == str.lower():
-                return i
-        raise ValueError
-
-
-class PublisherTable(SimpleTable):
-    """
-    Class that represents the Publisher table of the steamgames db, each member of the class represents a row
-    of the table
-
-    Class Variables:
-        table: array -> Class wide array to store each member of the class
-
-    Attributes:
-        id: int -> MySQL primary index
-        name: str -> Name of the Publisher
+        # ids are 1 indexed, the table is 0 indexed
+        return cls.get_id(str) - 1
 
-    Methods:
-        to_sql_insert(self): str ->  Converts a member of a class into a SQL insert statement
-
-    Class Methods:
-        __contains__(cls, str): bool -> Returns whether str is in the table
-        def index(cls, str): int -> Returns the index of str in the table if it exists, raises value error otherwise
-    """
-    table = []
-    def __init__(self, name):
-        """
-        Initializes an instance of the publisher class and appends it to the table class variable
-
-        Parameters:
-            name: str -> Name of the publisher
-
-        Returns:
-            None
-
-        Raises:
-            ValueError on invalid data
-        """
-        id = len(PublisherTable.table) + 1
-        super().__init__(name, id)
-        PublisherTable.table.append(self)
-    
-    def to_sql_insert(self):
-        """
-        Converts self into an SQL insert statement
-
-        Returns:
-            str -> SQL insert statement
-        """
-        return f"INSERT INTO Publisher(ID, Name) VALUES({self.id},\"{self.name}\");"
-    
-    @classmethod
-    def __contains__(cls, str: str):
-        """
-        Returns whether the given string a name of an element in the table
-        
-        Parameters:
-            str: str -> Name of rating to find existence of
-        
-        Returns:
-            bool -> Returns True if str is the name of an element in the table, False otherwise
-        """
-        for e in cls.table:
-            if e.name.lower() == str.lower():
-                return True
-        return False
-    
     @classmethod
-    def index(cls, str):
+    def get_id(cls, str):
         """
-        Returns the index of the publisher with the same name as the given string in the table. Raises a ValueError if str is not a name of an element of the table
+        Returns the id of the row with the same name as the given string. Raises a ValueError if str is not a name of an element of the table
         
         Parameters:
-            str: str -> Name of publisher to search for index
+            str: str -> Name of the row to search for
         
         Returns:
-            int -> Index of str in the table
+            int -> id of str in the table
             
         Raises:
             ValueError if str is not found in the table
         """
-        for i in range(len(cls.table)):
-            if cls.table[i].name.lower() == str.lower():
-                return i
-        raise ValueError
+        id = cls._index.get(str.casefold())
+        if id is None:
+            raise ValueError(f"{str} is not in the {cls.__name__}")
+        return id
 
 
-class RatingTable(SimpleTable):
+class DeveloperTable(LookupTable):
     """
-    Class that represents the Rating table of the steamgames db, each member of the class represents a row
-    of the table
-
-    Class Variables:
-        table: array -> Class wide array to store each member of the class
-
-    Attributes:
-        id: int -> MySQL primary index
-        name: str -> Name of the rating
+    Class that represents the Developer table of the steamgames db, each member of the class represents a row
+    of the table, see LookupTable
+    """
+    __slots__ = ()
+    table = []
+    _index = {}
+    _sql_header = "INSERT INTO Developer(ID, Name) VALUES"
 
-    Methods:
-        to_sql_insert(self): str ->  Converts a member of a class into a SQL insert statement
 
-    Class Methods:
-        __contains__(cls, str): bool -> Returns whether str is in the table
-        def index(cls, str): int -> Returns the index of str in the table if it exists, raises value error otherwise
+class PublisherTable(LookupTable):
     """
+    Class that represents the Publisher table of the steamgames db, each member of the class represents a row
+    of the table, see LookupTable
+    """
+    __slots__ = ()
     table = []
-    def __init__(self, name):
-        """
-        Initializes an instance of the rating class and appends it to the table class variable
+    _index = {}
+    _sql_header = "INSERT INTO Publisher(ID, Name) VALUES"
 
-        Parameters:
-            name: str -> Name of the rating
 
-        Returns:
-            None
+class RatingTable(LookupTable):
+    """
+    Class that represents the Rating table of the steamgames db, each member of the class represents a row
+    of the table, see LookupTable
+    """
+    __slots__ = ()
+    table = []
+    _index = {}
+    _name_char_limit = 16
+    _sql_header = "INSERT INTO Rating(ID, Name, RatingSystem) VALUES"
 
-        Raises:
-            ValueError on invalid data
-        """
-        id = len(RatingTable.table) + 1
-        super().__init__(name, id, 16)
-        RatingTable.table.append(self)
-    
-    def to_sql_insert(self):
+    def _sql_values(self) -> str:
         """
-        Converts self into an SQL insert statement
+        Converts self into the parenthesized values of an SQL insert statement
 
         Returns:
-            str -> SQL insert statement
+            str -> Values of self formatted for an SQL insert statement
         """
         # Currently the spreadsheet only has ratings in PEGI, but this class could be amended to handle other game rating system
-        return f"INSERT INTO Rating(ID, Name, RatingSystem) VALUES({self.id},'{self.name}','PEGI');"
-    
-    @classmethod
-    def __contains__(cls, str):
-        """
-        Returns whether the given string a name of an element in the table
-        
-        Parameters:
-            str: str -> Name of rating to find existence of
-        
-        Returns:
-            bool -> Returns True if str is the name of an element in the table, False otherwise
-        """
-        for e in cls.table:
-            if e.name.lower() == str.lower():
-                return True
-        return False
-    
-    @classmethod
-    def index(cls, str):
-        """
-        Returns the index of the rating with the same name as the given string in the table. Raises a ValueError if str is not a name of an element of the table
-        
-        Parameters:
-            str: str -> Name of rating to search for index
-        
-        Returns:
-            int -> Index of str in the table
-            
-        Raises:
-            ValueError if str is not found in the table
-        """
-        for i in range(len(cls.table)):
-            if cls.table[i].name.lower() == str.lower():
-                return i
-        raise ValueError
+        return f"({self.id},'{self.name}','PEGI')"
 
 
-class PlatformTable(SimpleTable):
+class PlatformTable(LookupTable):
     """
     Class that represents the Platform table of the steamgames db, each member of the class represents a row
-    of the table
-
-    Class Variables:
-        table: array -> Class wide array to store each member of the class
-
-    Attributes:
-        id: int -> MySQL primary index
-        name: str -> Name of the platform
-
-    Methods:
-        to_sql_insert(self): str ->  Converts a member of a class into a SQL insert statement
-
-    Class Methods:
-        __contains__(cls, str): bool -> Returns whether str is in the table
-        def index(cls, str): int -> Returns the index of str in the table if it exists, raises value error otherwise
+    of the table, see LookupTable
     """
+    __slots__ = ()
     table = []
-    def __init__(self, name):
-        """
-        Initializes an instance of the platform class and appends it to the table class variable
-
-        Parameters:
-            name: str -> Name of the platform
+    _index = {}
+    _name_char_limit = 16
+    _sql_header = "INSERT INTO Platform(ID, Name) VALUES"
 
-        Returns:
-            None
-
-        Raises:
-            ValueError on invalid data
-        """
-        id = len(PlatformTable.table) + 1
-        super().__init__(name, id, 16)
-        PlatformTable.table.append(self)
-    
-    def to_sql_insert(self):
+    def _sql_values(self) -> str:
         """
-        Converts self into an SQL insert statement
+        Converts self into the parenthesized values of an SQL insert statement
 
         Returns:
-            str -> SQL insert statement
-        """
-        return f"INSERT INTO Platform(ID, Name) VALUES({self.id},'{self.name}');"
-    
-    @classmethod
-    def __contains__(cls, str):
-        """
-        Returns whether the given string a name of an element in the table
-        
-        Parameters:
-            str: str -> Name of rating to find existence of
-        
-        Returns:
-            bool -> Returns True if str is the name of an element in the table, False otherwise
-        """
-        for e in cls.table:
-            if e.name.lower() == str.lower():
-                return True
-        return False
-    
-    @classmethod
-    def index(cls, str):
-        """
-        Returns the index of the platform with the same name as the given string in the table. Raises a ValueError if str is not a name of an element of the table
-        
-        Parameters:
-            str: str -> Name of platform to search for index
-        
-        Returns:
-            int -> Index of str in the table
-            
-        Raises:
-            ValueError if str is not found in the table
+            str -> Values of self formatted for an SQL insert statement
         """
-        for i in range(len(cls.table)):
-            if cls.table[i].name.lower() == str.lower():
-                return i
-        raise ValueError
+        return f"({self.id},'{self.name}')"
 
 
-class CategoryTable(SimpleTable):
+class CategoryTable(LookupTable):
     """
     Class that represents the Category table of the steamgames db, each member of the class represents a row
-    of the table
-
-    Class Variables:
-        table: array -> Class wide array to store each member of the class
-
-    Attributes:
-        id: int -> MySQL primary index
-        name: str -> Name of the category
-
-    Methods:
-        to_sql_insert(self): str ->  Converts a member of a class into a SQL insert statement
-
-    Class Methods:
-        __contains__(cls, str): bool -> Returns whether str is in the table
-        def index(cls, str): int -> Returns the index of str in the table if it exists, raises value error otherwise
+    of the table, see LookupTable
     """
+    __slots__ = ()
     table = []
-    def __init__(self, name):
-        """
-        Initializes an instance of the category class and appends it to the table class variable
-
-        Parameters:
-            name: str -> Name of the category
+    _index = {}
+    _sql_header = "INSERT INTO Category(ID, Name) VALUES"
 
-        Returns:
-            None
-
-        Raises:
-            ValueError on invalid data
-        """
-        id = len(CategoryTable.table) + 1
-        super().__init__(name, id)
-        CategoryTable.table.append(self)
-    
-    def to_sql_insert(self):
+    def _sql_values(self) -> str:
         """
-        Converts self into an SQL insert statement
+        Converts self into the parenthesized values of an SQL insert statement
 
         Returns:
-            str -> SQL insert statement
+            str -> Values of self formatted for an SQL insert statement
         """
-        return f"INSERT INTO Category(ID, Name) VALUES({self.id},'{self.name}');"
-    
-    @classmethod
-    def __contains__(cls, str):
-        """
-        Returns whether the given string a name of an element in the table
-        
-        Parameters:
-            str: str -> Name of category to find existence of
-        
-        Returns:
-            bool -> Returns True if str is the name of an element in the table, False otherwise
-        """
-        for e in cls.table:
-            if e.name.lower() == str.lower():
-                return True
-        return False
-    
-    @classmethod
-    def index(cls, str):
-        """
-        Returns the index of the category with the same name as the given string in the table. Raises a ValueError if str is not a name of an element of the table
-        
-        Parameters:
-            str: str -> Name of category to search for index
-        
-        Returns:
-            int -> Index of str in the table
-            
-        Raises:
-            ValueError if str is not found in the table
-        """
-        for i in range(len(cls.table)):
-            if cls.table[i].name.lower() == str.lower():
-                return i
-        raise ValueError
+        return f"({self.id},'{self.name}')"
 
 
-class GenreTable(SimpleTable):
+class GenreTable(LookupTable):
     """
     Class that represents the Genre table of the steamgames db, each member of the class represents a row
-    of the table
-
-    Class Variables:
-        table: array -> Class wide array to store each member of the class
-
-    Attributes:
-        id: int -> MySQL primary index
-        name: str -> Name of the genre
-
-    Methods:
-        to_sql_insert(self): str ->  Converts a member of a class into a SQL insert statement
-
-    Class Methods:
-        __contains__(cls, str): bool -> Returns whether str is in the table
-        def index(cls, str): int -> Returns the index of str in the table if it exists, raises value error otherwise
+    of the table, see LookupTable
     """
+    __slots__ = ()
     table = []
-    def __init__(self, name):
-        """
-        Initializes an instance of the genre class and appends it to the table class variable
-
-        Parameters:
-            name: str -> Name of the genre
-
-        Returns:
-            None
+    _index = {}
+    _sql_header = "INSERT INTO Genre(ID, Name) VALUES"
 
-        Raises:
-            ValueError on invalid data
+    def _sql_values(self) -> str:
         """
-        id = len(GenreTable.table) + 1
-        super().__init__(name, id)
-        GenreTable.table.append(self)
-    
-    def to_sql_insert(self):
-        """
-        Converts self into an SQL insert statement
+        Converts self into the parenthesized values of an SQL insert statement
 
         Returns:
-            str -> SQL insert statement
+            str -> Values of self formatted for an SQL insert statement
         """
-        return f"INSERT INTO Genre(ID, Name) VALUES({self.id}, '{self.name}');"
-    
-    @classmethod
-    def __contains__(cls, str):
-        """
-        Returns whether the given string a name of an element in the table
-        
-        Parameters:
-            str: str -> Name of genre to find existence of
-        
-        Returns:
-            bool -> Returns True if str is the name of an element in the table, False otherwise
-        """
-        for e in cls.table:
-            if e.name.lower() == str.lower():
-                return True
-        return False
-    
-    @classmethod
-    def index(cls, str):
-        """
-        Returns the index of the genre with the same name as the given string in the table. Raises a ValueError if str is not a name of an element of the table
-        
-        Parameters:
-            str: str -> Name of genre to search for index
-        
-        Returns:
-            int -> Index of str in the table
-            
-        Raises:
-            ValueError if str is not found in the table
-        """
-        for i in range(len(cls.table)):
-            if cls.table[i].name.lower() == str.lower():
-                return i
-        raise ValueError
-    
-    
+        return f"({self.id}, '{self.name}')"
+
+
 class IntersectionTable():
     """
     Represents an intersection table of the steamgames db.
     
     Attributes:
-        _table: dict -> Dictionary containing the elements of the table keyed by pairs of ids from the 
-        left table and the right table. The value saved is normally 1, but for the GameTags table it represents
+        _left: array -> ids from the left table of each entry, in insertion order
+        _right: array -> ids from the right table of each entry, parallel to _left
+        _count: array -> Value saved for each entry, parallel to _left. It is normally 1, but for the GameTags table it represents
         the number of times the game was tagged by that genre
+        _seen: set -> (left_id, right_id) pair of every entry packed into a single int, used to reject duplicates
         
         left_key: str -> Name of the left_table's id
         right_key: str -> Name of the right_table's id
-        name: str -> Name of the table, which is the combination of the left_table and right_table's and in plural
+        name: str -> Name of the table, by default the combination of the left_table and right_table's and in plural
     
     Methods:
         add_entry(self, left_id, right_id, count=1) -> Adds a value, count, to the table keyed by (left_id, right_id)
         to_sql_insert(self, include_val=False) -> Converts a IntersectionTable's contents into SQL Insert statements
+        to_bulk_sql_insert(self, include_val=False, chunk) -> Converts a IntersectionTable's contents into multi-row SQL Insert statements
+        write_sql(self, fp, include_val=False, chunk) -> Writes a IntersectionTable's contents to a file as multi-row SQL Insert statements
+        _sql_header(self, include_val=False) -> Returns the start of an SQL insert statement for the table
+        _sql_values(self, include_val=False) -> Converts each entry of the table into the values of an SQL insert statement
     """
-    def __init__(self, left_table: str, right_table: str) -> None:
+    def __init__(self, left_table: str, right_table: str, name: str = None) -> None:
         """
         Inititalizes an IntersectionTable
         
         Parameters:
             left_table: str -> Name of the left table
             right_table: str -> Name of the right table
+            name: str -> Name of the table when it isn't the plural of the two tables, eg GameTags which links Game to Genre
         
         Returns:
             None
         """
-        self._table = {}
+        # Unsigned 32 bit arrays take 4 bytes per id instead of a tuple of boxed ints per entry
+        self._left = array('I')
+        self._right = array('I')
+        self._count = array('I')
+        self._seen = set()
         self.left_key = left_table + 'ID'
         self.right_key = right_table + 'ID'
 
         # Replacing 'y' with 'ies' for plural works most of the time, English isn't that simple however. But It does work here
-        if right_table[-1] == 'y':
+        if name is not None:
+            self.name = name
+        elif right_table[-1] == 'y':
             self.name = left_table + right_table[:-1] + "ies"
         else:
             self.name = left_table + right_table + 's'
@@ -705,10 +568,43 @@ class IntersectionTable():
             ValueError if (left_id, right_id) is already in the table
         """
         # If the entry is already in the table we shouldn't add it, this should never happen in practice
-        if (left_id,right_id) in self._table:
-            print(f"{left_id}, {right_id} not inserted into the {self.name} table because the keys were already in the table")
-            raise ValueError
-        self._table[(left_id,right_id)] = count
+        key = (left_id << 32) | right_id
+        if key in self._seen:
+            raise ValueError(f"{left_id}, {right_id} not inserted into the {self.name} table because the keys were already in the table")
+        self._seen.add(key)
+        self._left.append(left_id)
+        self._right.append(right_id)
+        self._count.append(count)
+
+    def _sql_header(self, include_val=False):
+        """
+        Returns the start of an SQL insert statement for the table, up to and including VALUES
+
+        Parameters:
+            include_val: bool -> Determines whether the value save in the table should be included in the insert statement.
+            Only set to True for the GameTags table
+
+        Returns:
+            str -> Start of the SQL insert statement
+        """
+        # The single intersection table that needs more data, (the GameTags table), stores it as the value
+        tag_count = ", TagCount" if include_val else ''
+        return f"INSERT INTO {self.name}({self.left_key}, {self.right_key}{tag_count}) VALUES"
+
+    def _sql_values(self, include_val=False):
+        """
+        Converts each entry of the table into the parenthesized values of an SQL insert statement
+
+        Parameters:
+            include_val: bool -> Determines whether the value save in the table should be included in the insert statement.
+            Only set to True for the GameTags table
+
+        Returns:
+            iterator -> Values of each entry formatted for an SQL insert statement
+        """
+        if include_val:
+            return (f"({left},{right},{count})" for left, right, count in zip(self._left, self._right, self._count))
+        return (f"({left},{right})" for left, right in zip(self._left, self._right))
 
     def to_sql_insert(self, include_val=False):
         """
@@ -721,17 +617,49 @@ class IntersectionTable():
         Returns:
             str -> String containing all SQL insert statements for the IntersectionTable
         """
-        tag_count = ''
-        tag_num = ''
-        name = self.name
-        sql_string = ''
-        # This is a hacky way to add more data to the single intersection table that needs it, (the GameTags table)
-        if include_val:
-            tag_count=", TagCount"
-            name="GameTags"
-        for key in self._table:
-            if include_val:
-                tag_num = f",{self._table[key]}"
-            sql_string += f"INSERT INTO {name}({self.left_key}, {self.right_key}{tag_count}) VALUES({key[0]},{key[1]}{tag_num});\n"
+        header = self._sql_header(include_val)
+        # join sizes the result once, adding to a string in a loop copies everything built so far for every entry
+        return ''.join(f"{header}{values};\n" for values in self._sql_values(include_val))
+
+    def to_bulk_sql_insert(self, include_val=False, chunk=BULK_INSERT_CHUNK):
+        """
+        Converts a IntersectionTable's contents into multi-row SQL Insert statements
+
+        Parameters:
+            include_val: bool -> Determines whether the value save in the table should be included in the insert statement.
+            Only set to True for the GameTags table
+            chunk: int -> Maximum number of rows in a single insert statement
         
-        return sql_string
\ No newline at end of file
+        Returns:
+            str -> String containing all SQL insert statements for the IntersectionTable
+        """
+        return _bulk_sql_insert(self._sql_header(include_val), self._sql_values(include_val), chunk)
+
+    def write_sql(self, fp, include_val=False, chunk=BULK_INSERT_CHUNK):
+        """
+        Writes a IntersectionTable's contents to fp as multi-row SQL Insert statements, one statement at a time
+
+        Parameters:
+            fp: file -> Text file to write the statements to
+            include_val: bool -> Determines whether the value save in the table should be included in the insert statement.
+            Only set to True for the GameTags table
+            chunk: int -> Maximum number of rows in a single insert statement
+        
+        Returns:
+            None
+        """
+        fp.writelines(_iter_bulk_sql_insert(self._sql_header(include_val), self._sql_values(include_val), chunk))
+
+
+def reset_all() -> None:
+    """
+    Empties every table in the module so a new set of data can be converted from scratch. Without this the tables, and the ids
+    handed out to new rows, carry over from any earlier conversion in the same session
+
+    Returns:
+        None
+    """
+    Game.game_list.clear()
+    for table in (DeveloperTable, PublisherTable, RatingTable, PlatformTable, CategoryTable, GenreTable):
+        table.table.clear()
+        table._index.clear()